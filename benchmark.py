@@ -0,0 +1,126 @@
+"""Rough timing checks for worksheet generation and rendering.
+
+Run with ``python benchmark.py``.
+"""
+import os
+import subprocess
+import sys
+import time
+from typing import Callable
+
+from pdf_creator import PDFCreator
+from preview import PreviewRenderer
+from render_pool import RenderPool
+from worksheet_generator import WorksheetGenerator
+
+ADDITION = {"max_num": 100}
+MIX = {"mix": [
+    {"operation": "Addition", "settings": {"max_num": 100}, "weight": 40},
+    {"operation": "Subtraction", "settings": {"max_num": 100}, "weight": 30},
+    {"operation": "Multiplication", "settings": {"digits_1": 2, "digits_2": 1}, "weight": 20},
+    {"operation": "Division", "settings": {"remainder_type": "Mixed"}, "weight": 10},
+]}
+
+
+def _time(fn: Callable, repeat: int) -> float:
+    """Return the mean wall-clock time of ``fn`` in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def bench_preview(repeat: int = 50):
+    """Compare an uncached/cached page preview against a full PDF render."""
+    generator = WorksheetGenerator(seed=1)
+    pdf_creator = PDFCreator()
+
+    def full_render():
+        grid = generator.generate_problems("addition", 20, ADDITION)
+        pdf_creator.create_grid_worksheet(grid, "", "Addition")
+        listed = generator.generate_problems("addition", 24, ADDITION)
+        pdf_creator.create_list_worksheet(listed, "", "Addition", 2, 12)
+
+    def cold_preview(fmt):
+        renderer = PreviewRenderer(pdf_creator)
+        render = renderer.render_svg if fmt == "svg" else renderer.render_png
+        return lambda: (render("addition", ADDITION, "grid"),
+                        render("addition", ADDITION, "list", 2, 12))
+
+    warm = PreviewRenderer(pdf_creator)
+    warm_svg = lambda: (warm.render_svg("addition", ADDITION, "grid"),
+                        warm.render_svg("addition", ADDITION, "list", 2, 12))
+    warm_svg()
+
+    print("preview (grid + list page)")
+    print(f"  full PDF render:   {_time(full_render, repeat):8.2f} ms")
+    print(f"  SVG preview:       {_time(lambda: cold_preview('svg')(), repeat):8.2f} ms")
+    print(f"  PNG preview (0.5x):{_time(lambda: cold_preview('png')(), repeat):8.2f} ms")
+    print(f"  cached SVG:        {_time(warm_svg, repeat):8.4f} ms")
+
+
+def bench_division():
+    """Time DivisionSampler draws (its distribution is tested in test_worksheet_generator.py)."""
+    print("division sampler")
+    settings = {"max_dividend": 999, "max_divisor": 20, "remainder_type": "Mixed"}
+    generator = WorksheetGenerator(seed=1)
+    sampler = generator._division_sampler(settings)
+    # ms per 1000 draws == µs per draw
+    per_draw = _time(lambda: sampler.draw_many(1000), 50)
+    per_problem = _time(lambda: generator.generate_problems("division", 1000, settings), 50)
+    print(f"  draw_many:          {per_draw:8.3f} µs/draw")
+    print(f"  generate_problems:  {per_problem:8.3f} µs/problem")
+
+
+def bench_pool(pool_size: int = 2):
+    """Compare cold first-page latency with the first page on a pre-warmed pool."""
+    job = {"layout": "grid", "page": 1, "operation": "Addition", "settings": ADDITION}
+
+    print("render pool (first page)")
+    # A fresh interpreter pays for the reportlab import and PDFCreator set-up
+    cold = subprocess.run(
+        [sys.executable, "-c",
+         "import time; started = time.perf_counter(); "
+         "from render_pool import _render_in_process; "
+         f"_render_in_process([{job!r}]); print(time.perf_counter() - started)"],
+        capture_output=True, text=True, check=True, cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    print(f"  cold process:  {float(cold.stdout) * 1000:8.2f} ms")
+
+    with RenderPool(pool_size, warm=False) as pool:
+        started = time.perf_counter()
+        pool.render_pages([job])
+        print(f"  warming pool:  {(time.perf_counter() - started) * 1000:8.2f} ms (in-process fallback)")
+        warm_up = pool.warm()
+        started = time.perf_counter()
+        pool.render_pages([job])
+        print(f"  warm pool:     {(time.perf_counter() - started) * 1000:8.2f} ms "
+              f"(workers ready {warm_up * 1000:.0f} ms later)")
+
+def bench_mixed(pages: int = 50):
+    """Compare mixed-operation page throughput with the single-operation path."""
+    generator = WorksheetGenerator(seed=1)
+    pdf_creator = PDFCreator()
+
+    print("mixed worksheets (grid + list page, answers included)")
+    for label, operation, settings in [("addition only", "addition", ADDITION),
+                                       ("weighted mix", "mixed", MIX)]:
+        def page():
+            grid = generator.generate_problems(operation, 20, settings)
+            pdf_creator.create_grid_worksheet(grid, "", operation)
+            pdf_creator.create_grid_answer_key(grid, "", operation)
+            listed = generator.generate_problems(operation, 36, settings)
+            pdf_creator.create_list_worksheet(listed, "", operation, 3, 12)
+            pdf_creator.create_list_answer_key(listed, "", operation, 3, 12)
+
+        generate = _time(lambda: generator.generate_problems(operation, 1000, settings), 20)
+        render = _time(page, pages)
+        print(f"  {label:14s} generate {1000 / generate * 1000:9.0f} problems/s, "
+              f"render {1000 / render:6.1f} page pairs/s")
+
+
+if __name__ == "__main__":
+    bench_preview()
+    bench_division()
+    bench_pool()
+    bench_mixed()
@@ -3,9 +3,12 @@ import io
 import zipfile
 from datetime import datetime
 from worksheet_generator import WorksheetGenerator
-from pdf_creator import PDFCreator
+from preview import PreviewRenderer
+from render_pool import RenderPool
 import base64
 
+OPERATIONS = ["Addition", "Subtraction", "Multiplication", "Division"]
+
 def main():
     st.set_page_config(
         page_title="Math Worksheet Generator",
@@ -13,6 +16,9 @@ def main():
         layout="wide"
     )
     
+    # Start the render workers now so they warm up before the first Generate click
+    get_render_pool()
+    
     # Header with branding space
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -26,39 +32,47 @@ def main():
         # Operation Selection
         operation = st.selectbox(
             "Select Operation",
-            ["Addition", "Subtraction", "Multiplication", "Division"]
+            OPERATIONS + ["Mixed"]
         )
         
         # Difficulty Settings based on operation
         st.subheader("Difficulty Settings")
         
-        difficulty_settings = {}
-        
-        if operation == "Addition":
-            max_num = st.slider("Maximum number", 1, 999, 100)
-            difficulty_settings = {"max_num": max_num}
-            
-        elif operation == "Subtraction":
-            max_num = st.slider("Maximum number", 1, 999, 100)
-            difficulty_settings = {"max_num": max_num}
-            
-        elif operation == "Multiplication":
-            digits_1 = st.slider("First number digits", 1, 4, 1)
-            digits_2 = st.slider("Second number digits", 1, 4, 1)
-            difficulty_settings = {"digits_1": digits_1, "digits_2": digits_2}
-            
-        elif operation == "Division":
-            max_dividend = st.slider("Maximum dividend", 10, 999, 100)
-            max_divisor = st.slider("Maximum divisor", 2, 20, 10)
-            remainder_type = st.radio(
-                "Remainder type",
-                ["No remainders", "With remainders", "Mixed"]
-            )
-            difficulty_settings = {
-                "max_dividend": max_dividend,
-                "max_divisor": max_divisor,
-                "remainder_type": remainder_type
-            }
+        if operation == "Mixed":
+            # Weighted mix of operations / difficulty levels on every page
+            entries = st.number_input("Number of mix entries", 1, 6, 3)
+            mix = []
+            for i in range(entries):
+                with st.expander(f"Mix entry {i + 1}", expanded=True):
+                    entry_operation = st.selectbox(
+                        "Operation",
+                        OPERATIONS,
+                        index=i % len(OPERATIONS),
+                        key=f"mix_operation_{i}"
+                    )
+                    weight = st.slider(
+                        "Weight",
+                        0, 100, 100 // entries,
+                        help="Relative to the other entries; weights need not add up to 100",
+                        key=f"mix_weight_{i}"
+                    )
+                    mix.append({
+                        "operation": entry_operation,
+                        "settings": difficulty_inputs(entry_operation, f"mix_{i}_"),
+                        "weight": weight
+                    })
+            difficulty_settings = {"mix": mix}
+            if any(entry["weight"] > 0 for entry in mix):
+                # Show the split plan_mix will actually use on a 20-problem grid page
+                counts = WorksheetGenerator().plan_mix(mix, 20)
+                st.caption("Per 20-problem page: " + ", ".join(
+                    f"{count} {entry['operation'].lower()}"
+                    for entry, count in zip(mix, counts) if count
+                ))
+            else:
+                st.warning("Give at least one mix entry a weight above 0.")
+        else:
+            difficulty_settings = difficulty_inputs(operation)
     
     # Main content area
     col1, col2 = st.columns([1, 1])
@@ -115,70 +129,70 @@ def main():
             - Format 2 pages: {format2_pages}
             """)
             
+            # Live layout preview (one sample page, no PDF rendering)
+            with st.expander("👀 Page preview", expanded=True):
+                renderer = get_preview_renderer()
+                layout = "grid" if format1_pages > 0 else "list"
+                prefer_png = st.checkbox(
+                    "Show preview as image (PNG)",
+                    help="Falls back to SVG if image previews get too slow"
+                )
+                # The slow-PNG fallback is per session; the renderer is shared
+                if st.session_state.get("png_preview_too_slow"):
+                    prefer_png = False
+                    st.caption("PNG previews were too slow; showing SVG instead.")
+                try:
+                    kind, image, too_slow = renderer.render(
+                        operation.lower(),
+                        difficulty_settings,
+                        layout,
+                        columns,
+                        questions_per_col,
+                        prefer_png=prefer_png
+                    )
+                except ValueError as e:
+                    st.warning(f"Cannot preview these settings: {e}")
+                else:
+                    if too_slow:
+                        st.session_state["png_preview_too_slow"] = True
+                    if kind == "png":
+                        data, mime = image, "image/png"
+                    else:
+                        data, mime = image.encode("utf-8"), "image/svg+xml"
+                    # Embed as an <img> so markdown never parses the drawing itself
+                    st.markdown(
+                        f'<img src="data:{mime};base64,{base64.b64encode(data).decode()}" '
+                        f'style="width: 100%; border: 1px solid #ddd;">',
+                        unsafe_allow_html=True
+                    )
+            
             # Generate worksheets button
             if st.button("🔄 Generate Worksheets", type="primary"):
                 with st.spinner("Generating worksheets..."):
                     try:
-                        # Initialize generator and PDF creator
-                        generator = WorksheetGenerator()
-                        pdf_creator = PDFCreator()
-                        
-                        # Generate worksheets and answer keys
-                        worksheet_files = []
-                        answer_files = []
-                        
-                        # Generate Format 1 worksheets
+                        # Describe each page; the warm render pool generates and draws them
+                        jobs = []
                         for page in range(format1_pages):
-                            problems = generator.generate_problems(
-                                operation.lower(),
-                                20,  # 4x5 grid
-                                difficulty_settings
-                            )
-                            
-                            # Create worksheet PDF
-                            worksheet_pdf = pdf_creator.create_grid_worksheet(
-                                problems,
-                                f"Worksheet - Page {page + 1}",
-                                operation
-                            )
-                            worksheet_files.append((f"worksheet_grid_{page + 1}.pdf", worksheet_pdf))
-                            
-                            # Create answer key PDF
-                            answer_pdf = pdf_creator.create_grid_answer_key(
-                                problems,
-                                f"Answer Key - Page {page + 1}",
-                                operation
-                            )
-                            answer_files.append((f"answers_grid_{page + 1}.pdf", answer_pdf))
-                        
-                        # Generate Format 2 worksheets
-                        questions_total = columns * questions_per_col
+                            jobs.append({
+                                "layout": "grid",
+                                "page": page + 1,
+                                "operation": operation,
+                                "settings": difficulty_settings
+                            })
                         for page in range(format2_pages):
-                            problems = generator.generate_problems(
-                                operation.lower(),
-                                questions_total,
-                                difficulty_settings
-                            )
-                            
-                            # Create worksheet PDF
-                            worksheet_pdf = pdf_creator.create_list_worksheet(
-                                problems,
-                                f"Worksheet - List Page {page + 1}",
-                                operation,
-                                columns,
-                                questions_per_col
-                            )
-                            worksheet_files.append((f"worksheet_list_{page + 1}.pdf", worksheet_pdf))
-                            
-                            # Create answer key PDF
-                            answer_pdf = pdf_creator.create_list_answer_key(
-                                problems,
-                                f"Answer Key - List Page {page + 1}",
-                                operation,
-                                columns,
-                                questions_per_col
-                            )
-                            answer_files.append((f"answers_list_{page + 1}.pdf", answer_pdf))
+                            jobs.append({
+                                "layout": "list",
+                                "page": page + 1,
+                                "operation": operation,
+                                "settings": difficulty_settings,
+                                "columns": columns,
+                                "questions_per_col": questions_per_col
+                            })
+                        
+                        # Generate worksheets and answer keys
+                        results = get_render_pool().render_pages(jobs)
+                        worksheet_files = [worksheet for worksheet, _ in results]
+                        answer_files = [answer for _, answer in results]
                         
                         # Create download options
                         if total_pages == 1:
@@ -235,6 +249,52 @@ def main():
         else:
             st.warning("Please select at least one page to generate.")
 
+def difficulty_inputs(operation, key_prefix=""):
+    """Show the difficulty widgets for one operation and return its settings."""
+    key = lambda name: f"{key_prefix}{name}" if key_prefix else None
+    
+    if operation == "Addition":
+        max_num = st.slider("Maximum number", 1, 999, 100, key=key("max_num"))
+        return {"max_num": max_num}
+        
+    elif operation == "Subtraction":
+        max_num = st.slider("Maximum number", 1, 999, 100, key=key("max_num"))
+        return {"max_num": max_num}
+        
+    elif operation == "Multiplication":
+        digits_1 = st.slider("First number digits", 1, 4, 1, key=key("digits_1"))
+        digits_2 = st.slider("Second number digits", 1, 4, 1, key=key("digits_2"))
+        return {"digits_1": digits_1, "digits_2": digits_2}
+        
+    elif operation == "Division":
+        max_dividend = st.slider("Maximum dividend", 10, 999, 100, key=key("max_dividend"))
+        max_divisor = st.slider("Maximum divisor", 2, 20, 10, key=key("max_divisor"))
+        remainder_type = st.radio(
+            "Remainder type",
+            ["No remainders", "With remainders", "Mixed"],
+            key=key("remainder_type")
+        )
+        return {
+            "max_dividend": max_dividend,
+            "max_divisor": max_divisor,
+            "remainder_type": remainder_type
+        }
+    
+    return {}
+
+@st.cache_resource
+def get_preview_renderer():
+    """Share one preview renderer (and its cache) across reruns."""
+    return PreviewRenderer()
+
+@st.cache_resource
+def get_render_pool():
+    """Start one render pool per server process, shared by all sessions.
+
+    Workers warm up in the background; pages render in-process until they are ready.
+    """
+    return RenderPool(warm=False)
+
 def create_zip_file(files, folder_name):
     """Create a ZIP file containing multiple PDF files."""
     zip_buffer = io.BytesIO()
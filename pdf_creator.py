@@ -5,7 +5,7 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 import io
-from typing import List, Dict
+from typing import List, Dict, Tuple
 from datetime import datetime
 # --- compatibility shim for old method name ---
 if not hasattr(canvas.Canvas, "drawCentredText"):
@@ -33,19 +33,7 @@ class PDFCreator:
 
         
         # Grid of problems (4 columns, 5 rows)
-        start_x = self.margin
-        start_y = self.page_height - 2.5 * inch
-        
-        col_width = (self.page_width - 2 * self.margin) / 4
-        row_height = (start_y - self.margin) / 5
-        
-        for i, problem in enumerate(problems[:20]):  # Ensure max 20 problems
-            row = i // 4
-            col = i % 4
-            
-            x = start_x + col * col_width
-            y = start_y - row * row_height
-            
+        for problem, (x, y, col_width, row_height) in zip(problems, self._grid_layout()):
             # Draw problem box
             self._draw_grid_problem(c, problem, x, y, col_width, row_height)
         
@@ -63,19 +51,7 @@ class PDFCreator:
 
         
         # Grid of answers
-        start_x = self.margin
-        start_y = self.page_height - 2.5 * inch
-        
-        col_width = (self.page_width - 2 * self.margin) / 4
-        row_height = (start_y - self.margin) / 5
-        
-        for i, problem in enumerate(problems[:20]):
-            row = i // 4
-            col = i % 4
-            
-            x = start_x + col * col_width
-            y = start_y - row * row_height
-            
+        for problem, (x, y, col_width, row_height) in zip(problems, self._grid_layout()):
             # Draw problem with answer
             self._draw_grid_answer(c, problem, x, y, col_width, row_height)
         
@@ -94,23 +70,9 @@ class PDFCreator:
 
         
         # Calculate layout
-        start_x = self.margin
-        start_y = self.page_height - 2.5 * inch
-        col_width = (self.page_width - 2 * self.margin) / columns
-        
-        problem_idx = 0
-        for col in range(columns):
-            x = start_x + col * col_width
-            y = start_y
-            
-            for row in range(min(questions_per_col, len(problems) - problem_idx)):
-                if problem_idx >= len(problems):
-                    break
-                
-                problem = problems[problem_idx]
-                self._draw_list_problem(c, problem, problem_idx + 1, x, y)
-                y -= 0.6 * inch
-                problem_idx += 1
+        layout = self._list_layout(columns, questions_per_col, len(problems))
+        for problem, (number, x, y) in zip(problems, layout):
+            self._draw_list_problem(c, problem, number, x, y)
         
         c.save()
         buffer.seek(0)
@@ -127,27 +89,49 @@ class PDFCreator:
 
         
         # Calculate layout
+        layout = self._list_layout(columns, questions_per_col, len(problems))
+        for problem, (number, x, y) in zip(problems, layout):
+            self._draw_list_answer(c, problem, number, x, y)
+        
+        c.save()
+        buffer.seek(0)
+        return buffer.getvalue()
+    
+    def _grid_layout(self) -> List[Tuple[float, float, float, float]]:
+        """Return (x, y, width, height) for each of the 20 grid cells (4x5 layout)."""
+        start_x = self.margin
+        start_y = self.page_height - 2.5 * inch
+        
+        col_width = (self.page_width - 2 * self.margin) / 4
+        row_height = (start_y - self.margin) / 5
+        
+        cells = []
+        for i in range(20):
+            row = i // 4
+            col = i % 4
+            cells.append((start_x + col * col_width, start_y - row * row_height,
+                          col_width, row_height))
+        return cells
+    
+    def _list_layout(self, columns: int, questions_per_col: int,
+                     count: int) -> List[Tuple[int, float, float]]:
+        """Return (number, x, y) for each problem in list format, column by column."""
         start_x = self.margin
         start_y = self.page_height - 2.5 * inch
         col_width = (self.page_width - 2 * self.margin) / columns
         
-        problem_idx = 0
+        positions = []
         for col in range(columns):
             x = start_x + col * col_width
             y = start_y
             
-            for row in range(min(questions_per_col, len(problems) - problem_idx)):
-                if problem_idx >= len(problems):
-                    break
+            for row in range(questions_per_col):
+                if len(positions) >= count:
+                    return positions
                 
-                problem = problems[problem_idx]
-                self._draw_list_answer(c, problem, problem_idx + 1, x, y)
+                positions.append((len(positions) + 1, x, y))
                 y -= 0.6 * inch
-                problem_idx += 1
-        
-        c.save()
-        buffer.seek(0)
-        return buffer.getvalue()
+        return positions
     
     def _draw_header(self, c: canvas.Canvas, title: str):
         """Draw page header with name/date fields and branding space."""
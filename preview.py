@@ -0,0 +1,222 @@
+import io
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Dict, Tuple, Optional
+from xml.sax.saxutils import escape
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from pdf_creator import PDFCreator
+from worksheet_generator import WorksheetGenerator
+
+PREVIEW_SEED = 0          # same settings → same sample problems → cache hits
+
+
+class _Surface:
+    """The subset of reportlab's Canvas that PDFCreator's page drawing uses.
+
+    Subclasses receive PDF coordinates (origin bottom-left, points) and emit
+    them in their own format, so PDFCreator's draw methods run unchanged.
+    """
+
+    def __init__(self, height: float):
+        self.height = height
+        self.font_name = "Helvetica"
+        self.font_size = 12
+        self.line_width = 1
+
+    def setFont(self, name: str, size: float):
+        self.font_name = name
+        self.font_size = size
+
+    def setLineWidth(self, width: float):
+        self.line_width = width
+
+    def stringWidth(self, text: str, font_name: str = None, font_size: float = None) -> float:
+        return stringWidth(text, font_name or self.font_name, font_size or self.font_size)
+
+    def drawString(self, x: float, y: float, text: str):
+        self._text(x, y, text, centred=False)
+
+    def drawCentredString(self, x: float, y: float, text: str):
+        self._text(x, y, text, centred=True)
+
+    drawCentredText = drawCentredString
+
+    @property
+    def bold(self) -> bool:
+        return self.font_name.endswith("-Bold")
+
+
+class _SVGSurface(_Surface):
+    """Collects drawing calls as SVG elements (PDF coordinates, y flipped)."""
+
+    def __init__(self, width: float, height: float):
+        super().__init__(height)
+        self.width = width
+        self.parts = []
+
+    def rect(self, x: float, y: float, width: float, height: float):
+        top = self.height - (y + height)
+        self.parts.append(
+            f'<rect x="{x:.1f}" y="{top:.1f}" width="{width:.1f}" height="{height:.1f}" '
+            f'fill="none" stroke="black" stroke-width="{self.line_width}"/>'
+        )
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self.parts.append(
+            f'<line x1="{x1:.1f}" y1="{self.height - y1:.1f}" x2="{x2:.1f}" '
+            f'y2="{self.height - y2:.1f}" stroke="black" stroke-width="{self.line_width}"/>'
+        )
+
+    def _text(self, x: float, y: float, text: str, centred: bool):
+        anchor = ' text-anchor="middle"' if centred else ""
+        weight = ' font-weight="bold"' if self.bold else ""
+        self.parts.append(
+            f'<text x="{x:.1f}" y="{self.height - y:.1f}" font-size="{self.font_size}"{weight}{anchor} '
+            f'xml:space="preserve">{escape(text)}</text>'
+        )
+
+    def getvalue(self) -> str:
+        return (
+            f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {self.width:.0f} {self.height:.0f}" '
+            f'font-family="Helvetica, Arial, sans-serif">'
+            f'<rect width="100%" height="100%" fill="white"/>'
+            + "".join(self.parts)
+            + "</svg>"
+        )
+
+
+class _PNGSurface(_Surface):
+    """Rasterises the same drawing calls with Pillow at a reduced scale."""
+
+    def __init__(self, width: float, height: float, scale: float):
+        from PIL import Image, ImageDraw
+
+        super().__init__(height)
+        self.scale = scale
+        self.image = Image.new("L", (round(width * scale), round(height * scale)), 255)
+        self.draw = ImageDraw.Draw(self.image)
+        self._fonts = {}
+
+    def _font(self, size: float):
+        from PIL import ImageFont
+
+        if size not in self._fonts:
+            self._fonts[size] = ImageFont.load_default(size=max(1, round(size * self.scale)))
+        return self._fonts[size]
+
+    def _pt(self, x: float, y: float) -> Tuple[float, float]:
+        return x * self.scale, (self.height - y) * self.scale
+
+    def _width(self) -> int:
+        return max(1, round(self.line_width * self.scale))
+
+    def rect(self, x: float, y: float, width: float, height: float):
+        self.draw.rectangle([self._pt(x, y + height), self._pt(x + width, y)],
+                            outline=0, width=self._width())
+
+    def line(self, x1: float, y1: float, x2: float, y2: float):
+        self.draw.line([self._pt(x1, y1), self._pt(x2, y2)], fill=0, width=self._width())
+
+    def _text(self, x: float, y: float, text: str, centred: bool):
+        # load_default() has no bold face or ×/÷ glyphs; weight is left to the PDF
+        text = text.replace("×", "x").replace("÷", "/")
+        self.draw.text(self._pt(x, y), text, fill=0, font=self._font(self.font_size),
+                       anchor="ms" if centred else "ls")
+
+    def getvalue(self) -> bytes:
+        buffer = io.BytesIO()
+        self.image.save(buffer, format="PNG", optimize=False)
+        return buffer.getvalue()
+
+
+class PreviewRenderer:
+    """Draws a single worksheet page to SVG/PNG for instant in-app previews.
+
+    Geometry comes from PDFCreator so the preview matches the PDF layout, and
+    results are kept in a small LRU cache keyed by the page settings.
+    """
+
+    def __init__(self, pdf_creator: Optional[PDFCreator] = None,
+                 cache_size: int = 32, max_latency: float = 0.25):
+        """Set up the geometry source, cache size and latency budget (seconds)."""
+        self.pdf_creator = pdf_creator or PDFCreator()
+        self.cache_size = cache_size
+        self.max_latency = max_latency
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()     # one renderer is shared by every session
+
+    def render_svg(self, operation: str, settings: Dict, layout: str = "grid",
+                   columns: int = 2, questions_per_col: int = 12) -> str:
+        """Return an SVG document previewing one worksheet page."""
+        return self._render("svg", operation, settings, layout, columns, questions_per_col)[0]
+
+    def render_png(self, operation: str, settings: Dict, layout: str = "grid",
+                   columns: int = 2, questions_per_col: int = 12,
+                   scale: float = 0.5) -> bytes:
+        """Return a downscaled PNG previewing one worksheet page."""
+        return self._render("png", operation, settings, layout, columns,
+                            questions_per_col, scale)[0]
+
+    def render(self, operation: str, settings: Dict, layout: str = "grid",
+               columns: int = 2, questions_per_col: int = 12,
+               prefer_png: bool = False) -> Tuple[str, object, bool]:
+        """Return (kind, image, too_slow) where kind is "png" or "svg".
+
+        ``too_slow`` is True when this PNG render overran ``max_latency``; the
+        caller decides whether to keep asking for PNG (e.g. per session).
+        """
+        if prefer_png:
+            png, latency = self._render("png", operation, settings, layout,
+                                        columns, questions_per_col, 0.5)
+            return "png", png, latency > self.max_latency
+        svg, _ = self._render("svg", operation, settings, layout, columns, questions_per_col)
+        return "svg", svg, False
+
+    def _render(self, fmt: str, operation: str, settings: Dict, layout: str,
+                columns: int, questions_per_col: int, scale: float = 1.0):
+        """Return (image, seconds spent rendering); cache hits report 0."""
+        # repr() so nested settings (e.g. a mixed-operation "mix" list) stay hashable
+        key = (fmt, operation.lower(), repr(sorted(settings.items())),
+               layout, columns, questions_per_col, scale)
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key], 0.0
+
+        started = time.perf_counter()
+        pdf = self.pdf_creator
+        if fmt == "svg":
+            surface = _SVGSurface(pdf.page_width, pdf.page_height)
+        else:
+            surface = _PNGSurface(pdf.page_width, pdf.page_height, scale)
+
+        count = 20 if layout == "grid" else columns * questions_per_col
+        problems = WorksheetGenerator(seed=PREVIEW_SEED).generate_problems(
+            operation.lower(), count, settings
+        )
+        self._draw_page(surface, problems, layout, columns, questions_per_col)
+        result = surface.getvalue()
+        latency = time.perf_counter() - started
+
+        with self._lock:
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result, latency
+
+    def _draw_page(self, surface: _Surface, problems: List[Dict], layout: str,
+                   columns: int, questions_per_col: int):
+        """Draw a worksheet page with PDFCreator's own drawing code."""
+        pdf = self.pdf_creator
+        pdf._draw_header(surface, "")
+
+        if layout == "grid":
+            for problem, cell in zip(problems, pdf._grid_layout()):
+                pdf._draw_grid_problem(surface, problem, *cell)
+        else:
+            positions = pdf._list_layout(columns, questions_per_col, len(problems))
+            for problem, (number, x, y) in zip(problems, positions):
+                pdf._draw_list_problem(surface, problem, number, x, y)
@@ -0,0 +1,223 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Tuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get("WORKSHEET_POOL_SIZE", "2"))
+DEFAULT_JOBS_PER_WORKER = int(os.environ.get("WORKSHEET_JOBS_PER_WORKER", "200"))
+WARM_TIMEOUT = 60.0       # seconds for the initial workers to report ready
+PAGE_TIMEOUT = 10.0       # seconds to wait for a page before the pool is presumed hung
+
+# Per-process state, filled in by _warm_worker when a worker starts
+_generator = None
+_pdf_creator = None
+
+
+def render_page(generator, pdf_creator, job: Dict) -> Tuple[Tuple[str, bytes], Tuple[str, bytes]]:
+    """Generate one page of problems and return its (name, pdf) worksheet and answer key.
+
+    ``job`` holds ``layout`` ("grid" or "list"), ``page`` (1-based), ``operation``,
+    ``settings`` and, for list pages, ``columns`` and ``questions_per_col``.
+    """
+    page = job["page"]
+    operation = job["operation"]
+    settings = job["settings"]
+
+    if job["layout"] == "grid":
+        problems = generator.generate_problems(operation.lower(), 20, settings)  # 4x5 grid
+        worksheet_pdf = pdf_creator.create_grid_worksheet(
+            problems, f"Worksheet - Page {page}", operation
+        )
+        answer_pdf = pdf_creator.create_grid_answer_key(
+            problems, f"Answer Key - Page {page}", operation
+        )
+        return ((f"worksheet_grid_{page}.pdf", worksheet_pdf),
+                (f"answers_grid_{page}.pdf", answer_pdf))
+
+    columns, questions_per_col = job["columns"], job["questions_per_col"]
+    problems = generator.generate_problems(
+        operation.lower(), columns * questions_per_col, settings
+    )
+    worksheet_pdf = pdf_creator.create_list_worksheet(
+        problems, f"Worksheet - List Page {page}", operation, columns, questions_per_col
+    )
+    answer_pdf = pdf_creator.create_list_answer_key(
+        problems, f"Answer Key - List Page {page}", operation, columns, questions_per_col
+    )
+    return ((f"worksheet_list_{page}.pdf", worksheet_pdf),
+            (f"answers_list_{page}.pdf", answer_pdf))
+
+
+def _warm_worker():
+    """Pool initializer: import reportlab, build the renderer and draw a throwaway page."""
+    global _generator, _pdf_creator
+    from pdf_creator import PDFCreator
+    from worksheet_generator import WorksheetGenerator
+
+    _generator = WorksheetGenerator()
+    _pdf_creator = PDFCreator()
+    for layout in ("grid", "list"):
+        render_page(_generator, _pdf_creator, {
+            "layout": layout, "page": 0, "operation": "Division",
+            "settings": {}, "columns": 2, "questions_per_col": 12,
+        })
+
+
+def _render_job(job: Dict):
+    return render_page(_generator, _pdf_creator, job)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _render_in_process(jobs: List[Dict]):
+    """Render jobs in the calling process (used while the pool is unavailable)."""
+    global _generator, _pdf_creator
+    if _pdf_creator is None:
+        from pdf_creator import PDFCreator
+        from worksheet_generator import WorksheetGenerator
+
+        _generator = WorksheetGenerator()
+        _pdf_creator = PDFCreator()
+    return [render_page(_generator, _pdf_creator, job) for job in jobs]
+
+
+class RenderPool:
+    """Pool of pre-warmed worker processes that render worksheet pages.
+
+    Each worker loads reportlab, builds its PDFCreator and renders a throwaway
+    page before taking jobs. After ``jobs_per_worker`` jobs per worker the whole
+    set of workers is replaced, which bounds memory growth. Pages render in the
+    calling process while the workers warm up, after a worker dies or hangs
+    (the pool is then rebuilt), and for good if the workers never start.
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE,
+                 jobs_per_worker: Optional[int] = DEFAULT_JOBS_PER_WORKER,
+                 warm: bool = True):
+        """Start the pool; with ``warm`` the call blocks until the workers are ready."""
+        self.pool_size = pool_size
+        self.jobs_per_worker = jobs_per_worker
+        # spawn, not fork: the Streamlit server process is multi-threaded
+        self._context = multiprocessing.get_context("spawn")
+        # The pool is shared by every Streamlit session, so swaps happen under a lock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._disabled = False
+        self._start()
+        if warm:
+            self.warm()
+
+    def _start(self):
+        """Start a fresh set of workers (caller holds the lock or is __init__)."""
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.pool_size,
+            mp_context=self._context,
+            initializer=_warm_worker,
+        )
+        self._generation += 1
+        self._jobs = 0
+        self._started = time.monotonic()
+        # Workers spawn on demand: one ping per worker starts them all now
+        self._pings = [self._executor.submit(_ping) for _ in range(self.pool_size)]
+
+    @staticmethod
+    def _discard(executor: ProcessPoolExecutor, kill: bool):
+        """Stop an executor without waiting on it; ``kill`` also ends hung workers."""
+        if kill:
+            # A hung worker never exits on its own; shutdown() has no force option
+            for process in list(getattr(executor, "_processes", {}).values()):
+                process.kill()
+        executor.shutdown(wait=False, cancel_futures=kill)
+
+    def _restart(self, generation: int, reason: str):
+        """Replace the workers, unless another session already replaced them."""
+        with self._lock:
+            if generation != self._generation or self._disabled:
+                return
+            logger.warning("Restarting render pool: %s", reason)
+            self._discard(self._executor, kill=True)
+            self._start()
+
+    def _disable(self, reason: str):
+        """Give up on the pool for good; pages render in-process from now on."""
+        logger.error("Render pool disabled, rendering in-process: %s", reason)
+        self._disabled = True
+        self._discard(self._executor, kill=True)
+
+    @property
+    def ready(self) -> bool:
+        """True once the workers have warmed up (never blocks).
+
+        If they fail to start, or do not finish warming within WARM_TIMEOUT,
+        the pool is logged and shut down rather than left respawning.
+        """
+        with self._lock:
+            if self._disabled:
+                return False
+            if all(ping.done() for ping in self._pings):
+                failed = [ping.exception() for ping in self._pings if ping.exception()]
+                if failed:
+                    self._disable(f"workers failed to start ({failed[0]!r})")
+                    return False
+                return True
+            if time.monotonic() - self._started > WARM_TIMEOUT:
+                self._disable(f"workers not ready after {WARM_TIMEOUT:.0f} s")
+            return False
+
+    def warm(self, timeout: float = WARM_TIMEOUT) -> float:
+        """Wait until the workers have warmed up; return the wait (seconds).
+
+        Returns immediately once the pool is warm. Raises TimeoutError if the
+        workers are not ready within ``timeout`` and BrokenProcessPool if they
+        failed to start.
+        """
+        started = time.perf_counter()
+        for ping in self._pings:
+            ping.result(timeout=max(0.0, started + timeout - time.perf_counter()))
+        return time.perf_counter() - started
+
+    def render_pages(self, jobs: List[Dict]) -> List[Tuple[Tuple[str, bytes], Tuple[str, bytes]]]:
+        """Render every job, returning results in job order.
+
+        Jobs run in the pool once it is warm, otherwise in this process. If a
+        worker dies or a page takes longer than PAGE_TIMEOUT, the pool is
+        rebuilt and the jobs run here.
+        """
+        if not self.ready:
+            return _render_in_process(jobs)
+
+        try:
+            with self._lock:
+                executor, generation = self._executor, self._generation
+                futures = [executor.submit(_render_job, job) for job in jobs]
+                self._jobs += len(jobs)
+                if (self.jobs_per_worker is not None and
+                        self._jobs >= self.jobs_per_worker * self.pool_size):
+                    # Old workers finish these jobs, then exit; new ones warm up
+                    self._discard(executor, kill=False)
+                    self._start()
+
+            return [future.result(timeout=PAGE_TIMEOUT) for future in futures]
+        except BrokenProcessPool as e:
+            self._restart(generation, f"a worker died ({e})")
+        except FutureTimeout:
+            self._restart(generation, f"no page within {PAGE_TIMEOUT:.0f} s")
+        return _render_in_process(jobs)
+
+    def close(self):
+        """Shut down the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,74 @@
+import os
+import signal
+import threading
+import time
+
+import pytest
+
+import render_pool
+from render_pool import RenderPool
+
+JOB = {"layout": "list", "page": 1, "operation": "Division", "settings": {},
+       "columns": 3, "questions_per_col": 15}
+
+
+def _render_with_deadline(pool, jobs, deadline=30):
+    """Run render_pages in a thread so a hang fails the test instead of the run."""
+    results = []
+    thread = threading.Thread(target=lambda: results.append(pool.render_pages(jobs)), daemon=True)
+    thread.start()
+    thread.join(deadline)
+    assert not thread.is_alive(), "render_pages hung"
+    return results[0]
+
+
+@pytest.fixture
+def pool():
+    with RenderPool(2) as pool:
+        yield pool
+
+
+def test_worker_killed_mid_render_is_recovered(pool):
+    jobs = [dict(JOB, page=i) for i in range(200)]
+    generation = pool._generation
+    threading.Timer(0.05, lambda: os.kill(next(iter(pool._executor._processes)),
+                                          signal.SIGKILL)).start()
+
+    results = _render_with_deadline(pool, jobs)
+
+    assert [worksheet[0] for worksheet, _ in results] == \
+        [f"worksheet_list_{i}.pdf" for i in range(200)]
+    assert pool._generation == generation + 1
+    pool.warm()
+    assert len(pool.render_pages([JOB])) == 1
+
+
+def test_hung_worker_times_out_and_restarts(pool, monkeypatch):
+    monkeypatch.setattr(render_pool, "PAGE_TIMEOUT", 1.0)
+    for pid in pool._executor._processes:
+        os.kill(pid, signal.SIGSTOP)
+
+    results = _render_with_deadline(pool, [JOB])
+
+    assert len(results) == 1
+    pool.warm()
+    assert len(pool.render_pages([JOB])) == 1
+
+
+def test_concurrent_failures_restart_once(pool):
+    generation = pool._generation
+    pool._restart(generation, "first session")
+    pool._restart(generation, "second session saw the same failure")
+    assert pool._generation == generation + 1
+
+
+def test_workers_that_never_warm_up_are_shut_down(monkeypatch):
+    monkeypatch.setattr(render_pool, "WARM_TIMEOUT", 0.5)
+    pool = RenderPool(1, warm=False)
+    for pid in pool._executor._processes:
+        os.kill(pid, signal.SIGSTOP)
+    time.sleep(0.6)
+
+    assert not pool.ready
+    assert pool._disabled
+    assert len(_render_with_deadline(pool, [JOB])) == 1
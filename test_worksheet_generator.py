@@ -0,0 +1,74 @@
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from worksheet_generator import DivisionSampler, WorksheetGenerator
+
+
+def _all_problems(max_dividend: int, max_divisor: int, remainder_type: str):
+    """Brute-force every valid (divisor, quotient, remainder) for the settings."""
+    for divisor in range(2, max_divisor + 1):
+        for quotient in range(1, max_dividend // divisor + 1):
+            for remainder in range(divisor):
+                if quotient * divisor + remainder > max_dividend:
+                    break
+                if remainder_type == "Mixed" or \
+                        (remainder == 0) == (remainder_type == "No remainders"):
+                    yield divisor, quotient, remainder
+
+
+def _chi_square_critical(dof: int, z: float = 3.09) -> float:
+    """Wilson–Hilferty approximation of the chi-square quantile (z=3.09 → p=0.001)."""
+    return dof * (1 - 2 / (9 * dof) + z * math.sqrt(2 / (9 * dof))) ** 3
+
+
+@pytest.mark.parametrize("remainder_type", ["No remainders", "With remainders", "Mixed"])
+@pytest.mark.parametrize("max_dividend, max_divisor", [(1, 2), (10, 20), (60, 20), (100, 10)])
+def test_division_sampler_covers_exactly_the_valid_problems(max_dividend, max_divisor,
+                                                            remainder_type):
+    expected = set(_all_problems(max_dividend, max_divisor, remainder_type))
+    if not expected:
+        with pytest.raises(ValueError):
+            DivisionSampler(max_dividend, max_divisor, remainder_type)
+        return
+
+    sampler = DivisionSampler(max_dividend, max_divisor, remainder_type)
+    decoded = [sampler._decode(table, index)
+               for table in sampler._modes for index in range(table[-1])]
+    assert sampler.count == len(decoded) == len(expected)
+    assert set(decoded) == expected
+
+
+@pytest.mark.parametrize("settings", [
+    (100, 10, "No remainders"),
+    (100, 10, "With remainders"),
+    (60, 20, "With remainders"),
+    (100, 10, "Mixed"),
+])
+def test_division_sampler_distribution(settings):
+    draws = 200_000
+    sampler = DivisionSampler(*settings, rng=random.Random(7))
+    observed = Counter(sampler.draw_many(draws))
+
+    # Each mode is uniform within itself; Mixed gives each mode half the draws
+    problems = list(_all_problems(*settings))
+    exact = sum(1 for _, _, r in problems if r == 0)
+    modes = (exact > 0) + (exact < len(problems))
+
+    def expected(remainder):
+        mode_total = exact if remainder == 0 else len(problems) - exact
+        return draws / modes / mode_total
+
+    assert set(observed) <= set(problems)
+    chi2 = sum((observed.get(key, 0) - expected(key[2])) ** 2 / expected(key[2])
+               for key in problems)
+    assert chi2 < _chi_square_critical(len(problems) - 1)
+
+
+def test_division_dividend_never_exceeds_max():
+    settings = {"max_dividend": 10, "max_divisor": 20, "remainder_type": "With remainders"}
+    problems = WorksheetGenerator(seed=1).generate_problems("division", 500, settings)
+    assert all(p["num1"] <= 10 and p["num1"] == p["answer"] * p["num2"] + p["remainder"]
+               for p in problems)
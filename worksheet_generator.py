@@ -1,38 +1,175 @@
 import random
-from typing import List, Dict, Tuple
+from bisect import bisect_right
+from typing import List, Dict, Tuple, Optional
+
+REMAINDER_TYPES = ["No remainders", "With remainders", "Mixed"]
+
+
+class DivisionSampler:
+    """Draws (divisor, quotient, remainder) uniformly from the valid problems.
+
+    A problem is valid when ``2 <= divisor <= max_divisor``, ``quotient >= 1``
+    and ``dividend = quotient * divisor + remainder <= max_dividend``. For each
+    remainder mode the number of valid tuples per divisor is counted once, so a
+    draw is one uniform index, a bisect over the cumulative counts, and some
+    arithmetic to decode the quotient and remainder.
+
+    "No remainders" and "With remainders" are uniform over their problems.
+    "Mixed" is not uniform over the union: it picks exact or with-remainder
+    50/50 (or whichever exists), then draws uniformly within that mode.
+    """
+    
+    def __init__(self, max_dividend: int, max_divisor: int, remainder_type: str,
+                 rng: Optional[random.Random] = None):
+        if remainder_type not in REMAINDER_TYPES:
+            raise ValueError(f"Unsupported remainder type: {remainder_type}")
+        
+        self.max_dividend = max_dividend
+        self.max_divisor = max_divisor
+        self.remainder_type = remainder_type
+        self.rng = rng or random.Random()
+        
+        self.divisors = list(range(2, max_divisor + 1))
+        # Cumulative tuple counts per divisor: exact (r == 0) and remainder (r >= 1)
+        self._exact = self._cumulative(self._count_exact)
+        self._remainder = self._cumulative(self._count_remainder)
+        
+        if remainder_type == "No remainders":
+            modes = [self._exact]
+        elif remainder_type == "With remainders":
+            modes = [self._remainder]
+        else:  # Mixed: half exact, half with remainder (as far as either exists)
+            modes = [self._exact, self._remainder]
+        self._modes = [table for table in modes if table and table[-1] > 0]
+        
+        if not self._modes:
+            raise ValueError(
+                f"No {remainder_type.lower()} division problems exist with dividend "
+                f"up to {max_dividend} and divisor up to {max_divisor}"
+            )
+    
+    @property
+    def count(self) -> int:
+        """Number of distinct problems this sampler can produce."""
+        return sum(table[-1] for table in self._modes)
+    
+    def _count_exact(self, divisor: int) -> int:
+        return self.max_dividend // divisor
+    
+    def _count_remainder(self, divisor: int) -> int:
+        # Quotient q contributes min(divisor - 1, max_dividend - q * divisor) remainders
+        full_blocks = max(0, (self.max_dividend - divisor + 1) // divisor)
+        partial = max(0, self.max_dividend - (full_blocks + 1) * divisor)
+        return full_blocks * (divisor - 1) + min(partial, divisor - 1)
+    
+    def _cumulative(self, count) -> List[int]:
+        table, total = [], 0
+        for divisor in self.divisors:
+            total += count(divisor)
+            table.append(total)
+        return table
+    
+    def _decode(self, table: List[int], index: int) -> Tuple[int, int, int]:
+        slot = bisect_right(table, index)
+        divisor = self.divisors[slot]
+        offset = index - (table[slot - 1] if slot else 0)
+        
+        if table is self._exact:
+            return divisor, offset + 1, 0
+        # Remainder blocks are divisor - 1 wide; only the last one can be short
+        quotient, remainder = divmod(offset, divisor - 1)
+        return divisor, quotient + 1, remainder + 1
+    
+    def draw(self) -> Tuple[int, int, int]:
+        """Return one uniformly drawn (divisor, quotient, remainder)."""
+        return self.draw_many(1)[0]
+    
+    def draw_many(self, n: int) -> List[Tuple[int, int, int]]:
+        """Return ``n`` independent uniform (divisor, quotient, remainder) draws."""
+        rng, modes, decode = self.rng, self._modes, self._decode
+        if len(modes) == 1:
+            table = modes[0]
+            total = table[-1]
+            return [decode(table, rng.randrange(total)) for _ in range(n)]
+        
+        draws = []
+        for _ in range(n):
+            table = modes[rng.random() < 0.5]
+            draws.append(decode(table, rng.randrange(table[-1])))
+        return draws
+
 
 class WorksheetGenerator:
     """Generates math problems for worksheets."""
     
-    def __init__(self):
+    def __init__(self, seed: Optional[int] = None):
         self.problems = []
+        self.rng = random.Random(seed)   # seeded generators give repeatable pages
+        self._division_samplers = {}
     
     def generate_problems(self, operation: str, count: int, settings: Dict) -> List[Dict]:
         """Generate a list of math problems based on operation and settings."""
-        problems = []
+        if operation == "mixed":
+            return self.generate_mixed_problems(settings.get("mix", []), count)
         
-        for _ in range(count):
-            if operation == "addition":
-                problem = self._generate_addition(settings)
-            elif operation == "subtraction":
-                problem = self._generate_subtraction(settings)
-            elif operation == "multiplication":
-                problem = self._generate_multiplication(settings)
-            elif operation == "division":
-                problem = self._generate_division(settings)
-            else:
-                raise ValueError(f"Unsupported operation: {operation}")
-            
-            problems.append(problem)
+        if operation == "division":
+            # Draw the whole batch from one precomputed table
+            draws = self._division_sampler(settings).draw_many(count)
+            return [self._division_problem(*draw) for draw in draws]
+        
+        generators = {
+            "addition": self._generate_addition,
+            "subtraction": self._generate_subtraction,
+            "multiplication": self._generate_multiplication,
+        }
+        if operation not in generators:
+            raise ValueError(f"Unsupported operation: {operation}")
+        
+        generate = generators[operation]
+        return [generate(settings) for _ in range(count)]
+    
+    def plan_mix(self, mix: List[Dict], count: int) -> List[int]:
+        """Split ``count`` problems across mix entries in proportion to their weights.
+        
+        Each entry is ``{"operation": ..., "settings": {...}, "weight": ...}``.
+        Counts are whole numbers that add up to ``count`` (largest remainder).
+        """
+        weights = [max(0, entry.get("weight", 1)) for entry in mix]
+        total = sum(weights)
+        if total <= 0:
+            raise ValueError("Mixed worksheets need at least one operation with a positive weight")
+        
+        shares = [count * weight / total for weight in weights]
+        counts = [int(share) for share in shares]
+        by_remainder = sorted(range(len(mix)), key=lambda i: shares[i] - counts[i], reverse=True)
+        for i in by_remainder[:count - sum(counts)]:
+            counts[i] += 1
+        return counts
+    
+    def generate_mixed_problems(self, mix: List[Dict], count: int,
+                                shuffle: bool = True) -> List[Dict]:
+        """Generate a page mixing several operations/difficulties by weight.
         
+        The page composition is planned up front and each entry's share is
+        generated in one batch, then the page is shuffled so operations interleave.
+        """
+        problems = []
+        for entry, share in zip(mix, self.plan_mix(mix, count)):
+            if share:
+                problems.extend(self.generate_problems(
+                    entry["operation"].lower(), share, entry.get("settings", {})
+                ))
+        
+        if shuffle:
+            self.rng.shuffle(problems)
         return problems
     
     def _generate_addition(self, settings: Dict) -> Dict:
         """Return a single addition problem (and its answer)."""
         max_num = settings.get("max_num", 100)
 
-        num1 = random.randint(1, max_num)
-        num2 = random.randint(1, max_num)
+        num1 = self.rng.randint(1, max_num)
+        num2 = self.rng.randint(1, max_num)
         answer = num1 + num2
 
         # Make sure the number with MORE digits is on top
@@ -61,8 +198,8 @@ class WorksheetGenerator:
         max_num = settings.get("max_num", 100)
         
         # Ensure positive result by making num1 >= num2
-        num2 = random.randint(1, max_num)
-        num1 = random.randint(num2, max_num)
+        num2 = self.rng.randint(1, max_num)
+        num1 = self.rng.randint(num2, max_num)
         answer = num1 - num2
         
         return {
@@ -85,8 +222,8 @@ class WorksheetGenerator:
         min_2 = 10**(digits_2 - 1) if digits_2 > 1 else 1
         max_2 = 10**digits_2 - 1
         
-        num1 = random.randint(min_1, max_1)
-        num2 = random.randint(min_2, max_2)
+        num1 = self.rng.randint(min_1, max_1)
+        num2 = self.rng.randint(min_2, max_2)
         answer = num1 * num2
         
         return {
@@ -98,36 +235,20 @@ class WorksheetGenerator:
             "formatted_problem": f"{num1:>4}\n×{num2:>3}\n____"
         }
     
-    def _generate_division(self, settings: Dict) -> Dict:
-        """Generate division problem."""
-        max_dividend = settings.get("max_dividend", 100)
-        max_divisor = settings.get("max_divisor", 10)
-        remainder_type = settings.get("remainder_type", "No remainders")
-        
-        divisor = random.randint(2, max_divisor)
-        
-        if remainder_type == "No remainders":
-            # Generate problems with no remainder
-            quotient = random.randint(1, max_dividend // divisor)
-            dividend = quotient * divisor
-            remainder = 0
-        
-        elif remainder_type == "With remainders":
-            # Generate problems with remainder
-            quotient = random.randint(1, max_dividend // divisor)
-            remainder = random.randint(1, divisor - 1)
-            dividend = quotient * divisor + remainder
-        
-        else:  # Mixed
-            # Randomly choose with or without remainder
-            if random.choice([True, False]):
-                quotient = random.randint(1, max_dividend // divisor)
-                dividend = quotient * divisor
-                remainder = 0
-            else:
-                quotient = random.randint(1, max_dividend // divisor)
-                remainder = random.randint(1, divisor - 1)
-                dividend = quotient * divisor + remainder
+    def _division_sampler(self, settings: Dict) -> DivisionSampler:
+        """Return the (cached) division sampler for these settings."""
+        key = (
+            settings.get("max_dividend", 100),
+            settings.get("max_divisor", 10),
+            settings.get("remainder_type", "No remainders"),
+        )
+        if key not in self._division_samplers:
+            self._division_samplers[key] = DivisionSampler(*key, rng=self.rng)
+        return self._division_samplers[key]
+    
+    def _division_problem(self, divisor: int, quotient: int, remainder: int) -> Dict:
+        """Build the problem dict for a drawn (divisor, quotient, remainder)."""
+        dividend = quotient * divisor + remainder
         
         # Format answer based on remainder
         if remainder == 0:
@@ -150,7 +271,7 @@ class WorksheetGenerator:
     def shuffle_problems(self, problems: List[Dict]) -> List[Dict]:
         """Shuffle the order of problems."""
         shuffled = problems.copy()
-        random.shuffle(shuffled)
+        self.rng.shuffle(shuffled)
         return shuffled
     
     def validate_settings(self, operation: str, settings: Dict) -> bool:
@@ -178,9 +299,16 @@ class WorksheetGenerator:
                        2 <= max_divisor <= 20 and
                        remainder_type in ["No remainders", "With remainders", "Mixed"])
             
+            elif operation == "mixed":
+                mix = settings.get("mix", [])
+                return (any(entry.get("weight", 1) > 0 for entry in mix) and
+                        all(self.validate_settings(entry["operation"].lower(),
+                                                   entry.get("settings", {}))
+                            for entry in mix))
+            
             return False
             
-        except (TypeError, ValueError):
+        except (TypeError, ValueError, KeyError):
             return False
     
     def get_difficulty_description(self, operation: str, settings: Dict) -> str:
@@ -201,4 +329,16 @@ class WorksheetGenerator:
             remainder = settings.get('remainder_type', 'No remainders')
             return f"Up to {dividend} ÷ {divisor}, {remainder.lower()}"
         
+        elif operation == "mixed":
+            # Relative weights; plan_mix turns them into whole problem counts per page
+            mix = [entry for entry in settings.get("mix", []) if entry.get("weight", 1) > 0]
+            if not mix:
+                return "Mixed operations (no entry has a positive weight)"
+            return "Weighted mix: " + "; ".join(
+                f"{entry['operation'].lower()} "
+                f"({self.get_difficulty_description(entry['operation'].lower(), entry.get('settings', {}))}) "
+                f"weight {entry.get('weight', 1)}"
+                for entry in mix
+            )
+        
         return "Custom settings"